@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 
 @dataclass(frozen=True)
@@ -10,29 +11,36 @@ class Employee:
 
 # Turnos demo (hardcode)
 # M = Mañana, T = Tarde, L = Libre, G = Guardia (demo)
-Schedule = Dict[str, List[str]]  # employee_code -> 7 valores (L..D)
+Schedule = Mapping[str, Tuple[str, ...]]  # employee_code -> 7 valores (L..D)
 
 
-def get_demo_employees() -> List[Employee]:
-    return [
-        Employee(code="A", name="Encarni"),
-        Employee(code="B", name="María"),
-        Employee(code="C", name="Fátima"),
-        Employee(code="D", name="Belén"),
-        Employee(code="E", name="Thalisa"),
-        Employee(code="X", name="Juán José"),
-    ]
+# Datos congelados a nivel de módulo: los getters devuelven siempre la misma
+# referencia (inmutable) en lugar de reconstruir listas/objetos en cada llamada.
+_DEMO_EMPLOYEES: Tuple[Employee, ...] = (
+    Employee(code="A", name="Encarni"),
+    Employee(code="B", name="María"),
+    Employee(code="C", name="Fátima"),
+    Employee(code="D", name="Belén"),
+    Employee(code="E", name="Thalisa"),
+    Employee(code="X", name="Juán José"),
+)
+
+# 7 días: L M X J V S D
+# Esto es solo para validar UI (habrá errores a propósito para ver alertas/cobertura)
+_DEMO_WEEK: Schedule = MappingProxyType({
+    "A": ("M", "M", "M", "M", "M", "L", "L"),
+    "B": ("M", "M", "M", "M", "M", "L", "L"),
+    "C": ("T", "T", "T", "T", "T", "L", "L"),
+    "D": ("T", "T", "T", "T", "T", "T", "L"),
+    "E": ("M", "M", "M", "M", "M", "T", "T"),
+    # Juán José: 2 tardes libres (demo)
+    "X": ("T", "L", "T", "L", "T", "L", "L"),
+})
+
+
+def get_demo_employees() -> Tuple[Employee, ...]:
+    return _DEMO_EMPLOYEES
 
 
 def get_demo_week_schedule() -> Schedule:
-    # 7 días: L M X J V S D
-    # Esto es solo para validar UI (habrá errores a propósito para ver alertas/cobertura)
-    return {
-        "A": ["M", "M", "M", "M", "M", "L", "L"],
-        "B": ["M", "M", "M", "M", "M", "L", "L"],
-        "C": ["T", "T", "T", "T", "T", "L", "L"],
-        "D": ["T", "T", "T", "T", "T", "T", "L"],
-        "E": ["M", "M", "M", "M", "M", "T", "T"],
-        # Juán José: 2 tardes libres (demo)
-        "X": ["T", "L", "T", "L", "T", "L", "L"],
-    }
+    return _DEMO_WEEK
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Iterable, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple, Union
+
+# Partes válidas de una ausencia
+_PARTS: FrozenSet[str] = frozenset({"FULL", "AM", "PM"})
+_HALF: FrozenSet[str] = frozenset({"AM", "PM"})
 
 
 # ----------------------------
@@ -32,42 +37,107 @@ class AbsencePolicy:
     asuntos_propios_days_per_year: float = 2.0
 
 
+# ----------------------------
+# Índice (validación en lote)
+# ----------------------------
+
+class AbsenceIndex:
+    """
+    Histórico indexado por trabajador y ordenado por fecha de inicio.
+    Pensado para validar muchas altas seguidas (importaciones) sin recorrer
+    todo el histórico cada vez: los solapes se buscan con bisect y el uso
+    por año se mantiene acumulado. Usa add() para ir incorporando altas.
+    """
+
+    def __init__(self, absences: Iterable[Absence] = ()) -> None:
+        self._by_emp: Dict[str, List[Absence]] = {}
+        self._starts: Dict[str, List[date]] = {}   # paralelo a _by_emp (para bisect)
+        self._max_span: Dict[str, int] = {}        # ausencia más larga (días) por trabajador
+        self._usage: UsageIndex = {}
+        for a in absences:
+            self.add(a)
+
+    def __iter__(self) -> Iterator[Absence]:
+        for lst in self._by_emp.values():
+            yield from lst
+
+    def __len__(self) -> int:
+        return sum(len(lst) for lst in self._by_emp.values())
+
+    def add(self, a: Absence) -> None:
+        emp = a.employee_code
+        starts = self._starts.setdefault(emp, [])
+        i = bisect_right(starts, a.start)
+        starts.insert(i, a.start)
+        self._by_emp.setdefault(emp, []).insert(i, a)
+
+        span = (a.end - a.start).days
+        if span > self._max_span.get(emp, 0):
+            self._max_span[emp] = span
+
+        _add_usage(self._usage, a)
+
+    def overlapping(self, new_absence: Absence) -> Iterator[Absence]:
+        """Ausencias del mismo trabajador que solapan con new_absence."""
+        emp = new_absence.employee_code
+        starts = self._starts.get(emp)
+        if not starts:
+            return
+        lst = self._by_emp[emp]
+
+        # Candidatas: empiezan antes del fin de la nueva y no tan pronto
+        # como para acabar antes de su inicio (acotado por la más larga)
+        lower = new_absence.start - timedelta(days=self._max_span.get(emp, 0))
+        i = bisect_right(starts, new_absence.end) - 1
+        while i >= 0 and starts[i] >= lower:
+            if _overlaps(lst[i], new_absence):
+                yield lst[i]
+            i -= 1
+
+
 def validate_new_absence(
     new_absence: Absence,
-    existing: Iterable[Absence],
+    existing: Union[Iterable[Absence], AbsenceIndex],
     policy: AbsencePolicy = AbsencePolicy(),
 ) -> Tuple[bool, str]:
     """
     Valida el alta de una ausencia contra el histórico existente.
     Devuelve (ok, mensaje). Si ok=False, el mensaje es el motivo.
+    Si existing es un AbsenceIndex se evita el recorrido lineal del histórico.
     """
 
     # Básicos
     if new_absence.end < new_absence.start:
         return False, "La fecha fin no puede ser anterior a la fecha inicio."
 
-    if new_absence.part not in ("FULL", "AM", "PM"):
+    if new_absence.part not in _PARTS:
         return False, "Parte inválida (usa FULL, AM o PM)."
 
     # Si es medio día, solo tiene sentido si start == end
-    if new_absence.part in ("AM", "PM") and new_absence.start != new_absence.end:
+    if new_absence.part in _HALF and new_absence.start != new_absence.end:
         return False, "Las ausencias de medio día deben ser de un solo día (inicio = fin)."
 
+    emp = new_absence.employee_code
+
     # Evitar solapes por trabajador
-    for a in existing:
-        if a.employee_code != new_absence.employee_code:
-            continue
-        if _overlaps(a, new_absence):
+    if isinstance(existing, AbsenceIndex):
+        if next(existing.overlapping(new_absence), None) is not None:
             return False, "Esta ausencia solapa con otra ausencia existente del trabajador."
+    else:
+        for a in existing:
+            if a.employee_code != emp:
+                continue
+            if _overlaps(a, new_absence):
+                return False, "Esta ausencia solapa con otra ausencia existente del trabajador."
 
     # Reglas por tipo
     code = new_absence.type_code.upper().strip()
 
     if code == "VAC":
-        return _validate_vacations(new_absence, existing, policy)
+        return _validate_vacations(new_absence, _usage_of(existing, emp, code), policy)
 
     if code == "AP":  # Asuntos propios
-        return _validate_asuntos_propios(new_absence, existing, policy)
+        return _validate_asuntos_propios(new_absence, _usage_of(existing, emp, code), policy)
 
     # Por defecto: sin tope (de momento)
     return True, "OK"
@@ -79,20 +149,14 @@ def validate_new_absence(
 
 def _validate_vacations(
     new_absence: Absence,
-    existing: Iterable[Absence],
+    usage: UsageIndex,
     policy: AbsencePolicy
 ) -> Tuple[bool, str]:
     # Calcula por año natural (si cruza años, se reparte)
+    emp = new_absence.employee_code
     years = range(new_absence.start.year, new_absence.end.year + 1)
     for y in years:
-        used = 0.0
-        for a in existing:
-            if a.employee_code != new_absence.employee_code:
-                continue
-            if a.type_code.upper().strip() != "VAC":
-                continue
-            used += _units_in_year(a, y)
-
+        used = usage.get((emp, "VAC", y), 0.0)
         used_after = used + _units_in_year(new_absence, y)
         limit = policy.vacation_days_per_year
 
@@ -109,19 +173,13 @@ def _validate_vacations(
 
 def _validate_asuntos_propios(
     new_absence: Absence,
-    existing: Iterable[Absence],
+    usage: UsageIndex,
     policy: AbsencePolicy
 ) -> Tuple[bool, str]:
     # Se limita por año natural del inicio (lo normal para AP)
+    # AP: si cruza año (no debería), el índice ya cuenta por el año de cada día
     y = new_absence.start.year
-    used = 0.0
-    for a in existing:
-        if a.employee_code != new_absence.employee_code:
-            continue
-        if a.type_code.upper().strip() != "AP":
-            continue
-        # AP: si cruza año (no debería), cuenta por el año de cada día
-        used += _units_in_year(a, y)
+    used = usage.get((new_absence.employee_code, "AP", y), 0.0)
 
     used_after = used + _units_in_year(new_absence, y)
     limit = policy.asuntos_propios_days_per_year
@@ -141,6 +199,41 @@ def _validate_asuntos_propios(
 # Helpers
 # ----------------------------
 
+# (employee_code, type_code normalizado, año) -> unidades usadas
+UsageIndex = Dict[Tuple[str, str, int], float]
+
+
+def _index_usage(existing: Iterable[Absence], emp: str, code: str) -> UsageIndex:
+    """
+    Recorre el histórico una sola vez y acumula, por año natural, solo las
+    unidades del trabajador y tipo (ya normalizado) que se están validando.
+    """
+    usage: UsageIndex = {}
+    for a in existing:
+        if a.employee_code != emp:
+            continue
+        if a.type_code.upper().strip() != code:
+            continue
+        for y, units in _units_by_year(a).items():
+            key = (emp, code, y)
+            usage[key] = usage.get(key, 0.0) + units
+    return usage
+
+
+def _add_usage(usage: UsageIndex, a: Absence) -> None:
+    code = a.type_code.upper().strip()
+    for y, units in _units_by_year(a).items():
+        key = (a.employee_code, code, y)
+        usage[key] = usage.get(key, 0.0) + units
+
+
+def _usage_of(existing: Union[Iterable[Absence], AbsenceIndex], emp: str, code: str) -> UsageIndex:
+    # El índice mantiene el uso de todos; un iterable se recorre solo para emp/code
+    if isinstance(existing, AbsenceIndex):
+        return existing._usage
+    return _index_usage(existing, emp, code)
+
+
 def _overlaps(a: Absence, b: Absence) -> bool:
     # Solape por fecha (incluyente)
     if a.end < b.start or b.end < a.start:
@@ -148,7 +241,7 @@ def _overlaps(a: Absence, b: Absence) -> bool:
 
     # Si ambos son medio día en el mismo día: AM no solapa con PM
     if a.start == a.end == b.start == b.end:
-        if a.part in ("AM", "PM") and b.part in ("AM", "PM"):
+        if a.part in _HALF and b.part in _HALF:
             return a.part == b.part  # AM vs PM no solapa, AM vs AM sí
     return True
 
@@ -164,9 +257,36 @@ def _units_in_year(a: Absence, year: int) -> float:
     if end < start:
         return 0.0
 
-    if a.part in ("AM", "PM"):
+    if a.part in _HALF:
         # medio día => solo un día (lo validamos arriba)
         return 0.5 if start == end else 0.0
 
     # FULL
     return float((end - start).days + 1)
+
+
+def _units_by_year(a: Absence) -> Dict[int, float]:
+    """
+    Reparte las unidades de una ausencia por año natural en una sola pasada.
+    Lo normal es un único año (rara vez dos), así que se evita recalcular
+    _units_in_year para cada año del rango.
+    """
+    if a.end < a.start:
+        return {}
+
+    if a.part in _HALF:
+        if a.start == a.end:
+            return {a.start.year: 0.5}
+        # medio día multi-día (no debería llegar aquí): misma regla que _units_in_year
+        return {y: _units_in_year(a, y) for y in range(a.start.year, a.end.year + 1)}
+
+    # FULL
+    if a.start.year == a.end.year:
+        return {a.start.year: float((a.end - a.start).days + 1)}
+
+    out: Dict[int, float] = {}
+    for y in range(a.start.year, a.end.year + 1):
+        start = max(a.start, date(y, 1, 1))
+        end = min(a.end, date(y, 12, 31))
+        out[y] = float((end - start).days + 1)
+    return out
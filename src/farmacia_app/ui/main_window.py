@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import List, Dict, Optional
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Callable, List, Dict, Mapping, Optional, Union
 
-from PySide6.QtCore import Qt, QDate
-from PySide6.QtGui import QFont, QColor
+from PySide6.QtCore import Qt, QAbstractTableModel, QDate, QModelIndex, QTimer, Signal
+from PySide6.QtGui import QBrush, QFont, QColor
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QComboBox,
@@ -22,14 +26,16 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QStyledItemDelegate,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QToolBar,
     QVBoxLayout,
     QWidget,
 )
 
-DAYS = ["L", "M", "X", "J", "V", "S", "D"]
+DAYS = ("L", "M", "X", "J", "V", "S", "D")
+
+# Semana por defecto (solo lectura, compartida): copiar con list() si hay que escribir
+_DEFAULT_WEEK = ("L",) * 7
 
 # --- Paleta UI ---
 ACCENT = "#1E88E5"
@@ -52,7 +58,27 @@ TURN_DEFS: Dict[str, Dict[str, str]] = {
     "L": {"label": "Libre", "hours": "No trabaja", "bg": "#F2F2F2", "fg": "#444444"},
     "G": {"label": "Guardia", "hours": "Pendiente de concretar", "bg": "#FFD9E6", "fg": "#7A0036"},
 }
-TURN_ORDER = ["M1", "M2", "M3", "M4", "M5", "T", "L", "G"]
+TURN_ORDER = ("M1", "M2", "M3", "M4", "M5", "T", "L", "G")
+TURN_ORDER_SET = frozenset(TURN_ORDER)
+
+# TURN_DEFS es estático: brochas precalculadas, el repintado no vuelve a parsear "#RRGGBB"
+TURN_BG: Dict[str, QBrush] = {k: QBrush(QColor(d["bg"])) for k, d in TURN_DEFS.items()}
+TURN_FG: Dict[str, QBrush] = {k: QBrush(QColor(d["fg"])) for k, d in TURN_DEFS.items()}
+
+
+@lru_cache(maxsize=None)
+def _tooltip(code: str) -> str:
+    d = TURN_DEFS[code]
+    return f"{code} = {d['label']} · {d['hours']}"
+
+
+@lru_cache(maxsize=1)
+def _base_font() -> QFont:
+    # Perezoso: QFont necesita la QApplication ya creada
+    font = QFont()
+    font.setPointSize(11)
+    return font
+
 
 # --------------------------
 # Ausencias / Permisos (XXV Convenio Oficinas de Farmacia 2022-2024 - Art. 26/27)
@@ -99,6 +125,44 @@ ABSENCE_DEFS: Dict[str, Dict[str, str]] = {
 }
 
 ABSENCE_ORDER = ["VAC", "AP", "BAJ", "FAL3", "FAL5", "ENF5", "ENF3", "BOD1", "BOD20", "PER24D", "PER31D", "PERSAB", "PER"]
+ABSENCE_TYPE_LABELS = [f"{c} - {ABSENCE_DEFS[c]['label']}" for c in ABSENCE_ORDER]
+
+# Tipo desconocido (p. ej. datos antiguos): estilo neutro
+ABSENCE_FALLBACK: Dict[str, str] = {"bg": "#E5E7EB", "fg": "#111827"}
+ABSENCE_BG: Dict[str, QBrush] = {k: QBrush(QColor(d["bg"])) for k, d in ABSENCE_DEFS.items()}
+ABSENCE_FG: Dict[str, QBrush] = {k: QBrush(QColor(d["fg"])) for k, d in ABSENCE_DEFS.items()}
+_ABSENCE_BG_FALLBACK = QBrush(QColor(ABSENCE_FALLBACK["bg"]))
+_ABSENCE_FG_FALLBACK = QBrush(QColor(ABSENCE_FALLBACK["fg"]))
+
+PART_LABELS: Dict[str, str] = {"FULL": "Día completo", "AM": "Mañana", "PM": "Tarde"}
+
+
+@lru_cache(maxsize=None)
+def _absence_tooltip(type_code: str, part: str) -> str:
+    # Parte fija del tooltip (sin notas): pocas combinaciones tipo x parte
+    label = ABSENCE_DEFS.get(type_code, {}).get("label", type_code)
+    return f"{type_code} · {label} · {PART_LABELS.get(part, part)}"
+
+
+# --------------------------
+# Leyenda (chips): hojas de estilo calculadas una vez
+# --------------------------
+def _chip_qss(bg: str, fg: str, weight: int) -> str:
+    return f"""
+    QLabel {{
+        background: {bg};
+        color: {fg};
+        border: 1px solid #cfcfcf;
+        border-radius: 10px;
+        padding: 4px 10px;
+        font-weight: {weight};
+    }}
+    """
+
+
+TURN_CHIP_QSS: Dict[str, str] = {k: _chip_qss(d["bg"], d["fg"], 600) for k, d in TURN_DEFS.items()}
+ABSENCE_CHIP_QSS: Dict[str, str] = {k: _chip_qss(d["bg"], d["fg"], 700) for k, d in ABSENCE_DEFS.items()}
+
 
 # Reglas de validación por tipo
 ABSENCE_RULES: Dict[str, Dict[str, object]] = {
@@ -125,10 +189,30 @@ ABSENCE_RULES: Dict[str, Dict[str, object]] = {
 }
 
 
-@dataclass
+# Reglas resueltas una vez por código: acceso por atributo en lugar de .get anidados
+@dataclass(frozen=True)
+class RuleSpec:
+    max_days: Optional[int] = None
+    max_per_year_days: Optional[int] = None
+    forced_part: Optional[str] = None
+
+
+EMPTY_SPEC = RuleSpec()
+ABSENCE_RULE_SPECS: Mapping[str, RuleSpec] = MappingProxyType({
+    k: RuleSpec(r.get("max_days"), r.get("max_per_year_days"), r.get("forced_part"))
+    for k, r in ABSENCE_RULES.items()
+})
+
+
+@dataclass(frozen=True, slots=True)
 class Employee:
     code: str
     name: str
+    # "A - Encarni": se calcula una vez al crear el empleado (tabla, combos...)
+    label: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "label", f"{self.code} - {self.name}")
 
 
 Schedule = dict[str, list[str]]  # employee_code -> 7 valores (L..D)
@@ -136,15 +220,27 @@ Schedule = dict[str, list[str]]  # employee_code -> 7 valores (L..D)
 
 def get_demo_employees() -> List[Employee]:
     return [
-        Employee(code="A", name="Encarni"),
-        Employee(code="B", name="María"),
-        Employee(code="C", name="Fátima"),
-        Employee(code="D", name="Belén"),
-        Employee(code="E", name="Thalisa"),
-        Employee(code="X", name="Dueño"),
+        Employee("A", "Encarni"),
+        Employee("B", "María"),
+        Employee("C", "Fátima"),
+        Employee("D", "Belén"),
+        Employee("E", "Thalisa"),
+        Employee("X", "Dueño"),
     ]
 
 
+@lru_cache(maxsize=256)
+def normalize_turn(value: Optional[str]) -> str:
+    # Alfabeto pequeño y entradas muy repetidas: se memoiza (mayúsculas, sin espacios, válido)
+    v = (value or "L").strip().upper()
+    return v if v in TURN_ORDER_SET else "L"
+
+
+def normalize_schedule(schedule: Schedule) -> Dict[str, tuple[str, ...]]:
+    # Normaliza una sola vez al cargar; tuplas como _DEFAULT_WEEK (nadie las edita en sitio)
+    return {emp_code: tuple(normalize_turn(v) for v in week) for emp_code, week in schedule.items()}
+
+
 def get_demo_week_schedule() -> Schedule:
     return {
         "A": ["M1", "M1", "M1", "M1", "M1", "L", "L"],
@@ -185,8 +281,9 @@ class TurnDelegate(QStyledItemDelegate):
     def setEditorData(self, editor, index):  # type: ignore[override]
         if editor is None:
             return
-        value = (index.data() or "").strip().upper()
-        if value not in TURN_DEFS:
+        # El modelo ya guarda códigos canónicos (normalize_schedule / setData)
+        value = index.data()
+        if value not in TURN_ORDER_SET:
             value = "L"
         editor.setCurrentText(value)
 
@@ -196,6 +293,251 @@ class TurnDelegate(QStyledItemDelegate):
         model.setData(index, editor.currentText(), Qt.EditRole)
 
 
+class WeekModel(QAbstractTableModel):
+    """
+    Rejilla semanal: columna 0 = empleado, 1..7 = días.
+    Datos en listas paralelas (nombres / turnos / ausencias); la vista solo
+    pide data() de las celdas visibles, sin un QTableWidgetItem por celda.
+    """
+
+    # fila, día (0..6), código anterior, código nuevo (ya normalizado)
+    turnEdited = Signal(int, int, str, str)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._headers: List[str] = ["Empleado", *DAYS]
+        self._names: List[str] = []
+        self._turns: List[List[str]] = []
+        self._absences: List[List[Optional[Absence]]] = []
+
+    def reset_rows(
+        self,
+        names: List[str],
+        turns: List[List[str]],
+        absences: List[List[Optional[Absence]]],
+    ) -> None:
+        self.beginResetModel()
+        self._names = names
+        self._turns = turns
+        self._absences = absences
+        self.endResetModel()
+
+    def update_rows(self, turns: List[List[str]], absences: List[List[Optional[Absence]]]) -> None:
+        # Mismas filas (mismos empleados): se sustituyen los datos sin reset del modelo
+        self._turns = turns
+        self._absences = absences
+        self.refresh_all()
+
+    def refresh_all(self) -> None:
+        # Un único dataChanged para toda la rejilla: la vista solo recalcula lo visible
+        if not self._names:
+            return
+        top = self.index(0, 0)
+        bottom = self.index(self.rowCount() - 1, self.columnCount() - 1)
+        self.dataChanged.emit(
+            top, bottom, [Qt.DisplayRole, Qt.BackgroundRole, Qt.ForegroundRole, Qt.ToolTipRole]
+        )
+
+    def same_rows(self, names: List[str]) -> bool:
+        return names == self._names
+
+    def count_per_day(self, code: str) -> List[int]:
+        # Recuento por columna directamente sobre las listas (sin pasar por index()/data())
+        counts = [0] * len(DAYS)
+        for turns, absences in zip(self._turns, self._absences):
+            for i, (v, a) in enumerate(zip(turns, absences)):
+                if a is None and v == code:
+                    counts[i] += 1
+        return counts
+
+    def set_headers(self, labels: List[str]) -> None:
+        self._headers = labels
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(labels) - 1)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else 1 + len(DAYS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # type: ignore[override]
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def flags(self, index):  # type: ignore[override]
+        if not index.isValid():
+            return Qt.NoItemFlags
+        base = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0 or self._absences[index.row()][index.column() - 1] is not None:
+            return base
+        return base | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):  # type: ignore[override]
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+
+        if role == Qt.FontRole:
+            return _base_font()
+
+        if c == 0:
+            return self._names[r] if role == Qt.DisplayRole else None
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        a = self._absences[r][c - 1]
+        if a is not None:
+            return self._absence_data(a, role)
+
+        v = self._turns[r][c - 1]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return v
+        if role == Qt.BackgroundRole:
+            return TURN_BG[v]
+        if role == Qt.ForegroundRole:
+            return TURN_FG[v]
+        if role == Qt.ToolTipRole:
+            return _tooltip(v)
+        return None
+
+    @staticmethod
+    def _absence_data(a: Absence, role: int):
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return a.type_code
+        if role == Qt.BackgroundRole:
+            return ABSENCE_BG.get(a.type_code, _ABSENCE_BG_FALLBACK)
+        if role == Qt.ForegroundRole:
+            return ABSENCE_FG.get(a.type_code, _ABSENCE_FG_FALLBACK)
+        if role == Qt.ToolTipRole:
+            tooltip = _absence_tooltip(a.type_code, a.part)
+            if a.notes:
+                tooltip += f"\nNotas: {a.notes}"
+            return tooltip
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):  # type: ignore[override]
+        if role != Qt.EditRole or not (self.flags(index) & Qt.ItemIsEditable):
+            return False
+        r, c = index.row(), index.column()
+
+        v = normalize_turn(value)
+        old = self._turns[r][c - 1]
+        if v == old:
+            # Editor cerrado sin cambiar el turno: ni repintado, ni "sin guardar", ni pie
+            return True
+
+        self._turns[r][c - 1] = v
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.BackgroundRole, Qt.ForegroundRole, Qt.ToolTipRole])
+        self.turnEdited.emit(r, c - 1, old, v)
+        return True
+
+
+class AbsencesModel(QAbstractTableModel):
+    """
+    Listado de ausencias sobre la lista compartida de MainWindow: las celdas
+    se formatean bajo demanda y altas/bajas notifican solo la fila afectada.
+    """
+
+    HEADERS = ("Empleado", "Tipo", "Inicio", "Fin", "Parte", "Notas")
+
+    def __init__(self, absences: List[Absence], emp_name_by_code: Dict[str, str], parent=None) -> None:
+        super().__init__(parent)
+        self._absences = absences
+        self._emp_name_by_code = emp_name_by_code
+
+    def append(self, a: Absence) -> None:
+        row = len(self._absences)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._absences.append(a)
+        self.endInsertRows()
+
+    def remove_at(self, row: int) -> None:
+        if not (0 <= row < len(self._absences)):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._absences[row]
+        self.endRemoveRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._absences)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # type: ignore[override]
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):  # type: ignore[override]
+        if not index.isValid():
+            return None
+        if role == Qt.FontRole:
+            return _base_font()
+        if role != Qt.DisplayRole:
+            return None
+
+        a = self._absences[index.row()]
+        c = index.column()
+        if c == 0:
+            return f"{a.employee_code} - {self._emp_name_by_code.get(a.employee_code, '')}"
+        if c == 1:
+            return f"{a.type_code} - {ABSENCE_DEFS.get(a.type_code, {}).get('label', a.type_code)}"
+        if c == 2:
+            return a.start.strftime("%d/%m/%Y")
+        if c == 3:
+            return a.end.strftime("%d/%m/%Y")
+        if c == 4:
+            return PART_LABELS.get(a.part, a.part)
+        return a.notes
+
+
+class WeekTableView(QTableView):
+    """
+    Columna de empleado redimensionable y días con ancho fijo: el espacio
+    sobrante se reparte solo cuando cambia el tamaño, sin medir celdas.
+    """
+
+    MIN_DAY_WIDTH = 90
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.horizontalHeader().sectionResized.connect(self._on_section_resized)
+
+    def setup_columns(self, name_width: int) -> None:
+        # Requiere el modelo ya asignado (las secciones deben existir)
+        h = self.horizontalHeader()
+        h.setStretchLastSection(False)
+        h.setSectionResizeMode(0, QHeaderView.Interactive)
+        for i in range(1, self.model().columnCount()):
+            h.setSectionResizeMode(i, QHeaderView.Fixed)
+        self.setColumnWidth(0, name_width)
+        self._fit_day_columns()
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        self._fit_day_columns()
+
+    def _on_section_resized(self, logical: int, old: int, new: int) -> None:
+        if logical == 0:
+            self._fit_day_columns()
+
+    def _fit_day_columns(self) -> None:
+        model = self.model()
+        if model is None:
+            return
+        days = model.columnCount() - 1
+        if days <= 0:
+            return
+        free = self.viewport().width() - self.columnWidth(0)
+        width = max(self.MIN_DAY_WIDTH, free // days)
+        for i in range(1, days + 1):
+            if self.columnWidth(i) != width:
+                self.setColumnWidth(i, width)
+
+
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
@@ -204,13 +546,46 @@ class MainWindow(QMainWindow):
 
         self._dirty = False
         self._employees: List[Employee] = get_demo_employees()
-        self._schedule = get_demo_week_schedule()
+        self._emp_name_by_code: Dict[str, str] = {e.code: e.name for e in self._employees}
+        self._employee_labels: List[str] = [e.label for e in self._employees]
+        self._schedule = normalize_schedule(get_demo_week_schedule())
 
         # Semana: ahora la controlamos con un datepicker en toolbar (Ir a)
         self._week_start: date = date(2026, 1, 1)  # demo inicial
 
         # Ausencias en memoria (luego persistimos)
         self._absences: List[Absence] = []
+        # Índices secundarios (se mantienen en alta/baja): validar sin recorrer todo
+        # Por empleado ordenadas por inicio, con las fechas de inicio en paralelo (bisect)
+        self._absences_by_emp: Dict[str, List[Absence]] = defaultdict(list)
+        self._starts_by_emp: Dict[str, List[date]] = defaultdict(list)
+        self._absences_by_type: Dict[str, List[Absence]] = defaultdict(list)
+        # Días ocupados por (empleado, año) como bitmask: bit n = día n del año
+        self._occupied: Dict[tuple[str, int], int] = {}
+
+        # Tardes por día de la semana visible (pie de cobertura)
+        self._tarde_counts: List[int] = [0] * len(DAYS)
+
+        # Recarga diferida de la semana (ver _schedule_reload)
+        self._reload_pending = False
+
+        # Debounce del selector "Ir a" (ver _on_week_picker_changed)
+        self._week_picker_timer = QTimer(self)
+        self._week_picker_timer.setSingleShot(True)
+        self._week_picker_timer.setInterval(150)
+        self._week_picker_timer.timeout.connect(self._apply_week_picker)
+
+        # Pie de cobertura: varias ediciones seguidas se pintan una sola vez
+        self._footer_timer = QTimer(self)
+        self._footer_timer.setSingleShot(True)
+        self._footer_timer.setInterval(0)
+        self._footer_timer.timeout.connect(self._update_footer)
+
+        # Semana (ordinal de _week_start) cuyas cabeceras están pintadas
+        self._header_key: int = -1
+
+        # Diálogos de aviso reutilizables (ver _message_box)
+        self._msgbox_cache: Dict[QMessageBox.Icon, QMessageBox] = {}
 
         # Toolbar
         self._toolbar = QToolBar("Semana")
@@ -326,15 +701,21 @@ class MainWindow(QMainWindow):
         self._pages = QStackedWidget()
         self._pages.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self._page_index: Dict[str, int] = {}
+        # Páginas perezosas: índice -> factoría (se construyen en la primera visita)
+        self._page_factories: Dict[int, Callable[[], QWidget]] = {}
+
+        # El modelo de ausencias vive aunque su página aún no se haya construido
+        self._abs_model = AbsencesModel(self._absences, self._emp_name_by_code, self)
 
+        placeholder = self._build_placeholder_page
         self._add_page("Calendario", self._build_calendar_page())
-        self._add_page("Empleados", self._build_placeholder_page("Empleados", "Alta/baja y horas objetivo."))
-        self._add_page("Turnos", self._build_placeholder_page("Turnos", "Catálogo (M1..), colores y chips."))
-        self._add_page("Reglas", self._build_placeholder_page("Reglas", "Coberturas, restricciones, preferencias."))
-        self._add_page("Ausencias", self._build_absences_page())
-        self._add_page("Validación", self._build_placeholder_page("Validación", "Alertas y conflictos accionables."))
-        self._add_page("Exportar", self._build_placeholder_page("Exportar", "PDF / Excel / CSV / ICS."))
-        self._add_page("Ajustes", self._build_placeholder_page("Ajustes", "Parámetros generales."))
+        self._add_page("Empleados", partial(placeholder, "Empleados", "Alta/baja y horas objetivo."))
+        self._add_page("Turnos", partial(placeholder, "Turnos", "Catálogo (M1..), colores y chips."))
+        self._add_page("Reglas", partial(placeholder, "Reglas", "Coberturas, restricciones, preferencias."))
+        self._add_page("Ausencias", self._build_absences_page)
+        self._add_page("Validación", partial(placeholder, "Validación", "Alertas y conflictos accionables."))
+        self._add_page("Exportar", partial(placeholder, "Exportar", "PDF / Excel / CSV / ICS."))
+        self._add_page("Ajustes", partial(placeholder, "Ajustes", "Parámetros generales."))
 
         self.sidebar.currentRowChanged.connect(self._on_nav_changed)
 
@@ -344,16 +725,31 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(central)
         self.sidebar.setCurrentRow(0)
 
-    def _add_page(self, title: str, widget: QWidget) -> None:
+    def _add_page(self, title: str, page: Union[QWidget, Callable[[], QWidget]]) -> None:
         item = QListWidgetItem(title)
         item.setToolTip(title)
         self.sidebar.addItem(item)
-        idx = self._pages.addWidget(widget)
+        if isinstance(page, QWidget):
+            idx = self._pages.addWidget(page)
+        else:
+            # Hueco vacío hasta que se navegue a la página
+            idx = self._pages.addWidget(QWidget())
+            self._page_factories[idx] = page
         self._page_index[title] = idx
 
+    def _ensure_page_built(self, idx: int) -> None:
+        factory = self._page_factories.pop(idx, None)
+        if factory is None:
+            return
+        stub = self._pages.widget(idx)
+        self._pages.insertWidget(idx, factory())
+        self._pages.removeWidget(stub)
+        stub.deleteLater()
+
     def _on_nav_changed(self, row: int) -> None:
         if row < 0:
             return
+        self._ensure_page_built(row)
         self._pages.setCurrentIndex(row)
         is_calendar = (row == self._page_index.get("Calendario", 0))
         self._toolbar.setVisible(is_calendar)
@@ -414,17 +810,19 @@ class MainWindow(QMainWindow):
 
         root.addLayout(self._build_legend())
 
-        self.table = QTableWidget()
+        self._week_model = WeekModel(self)
+        self._week_model.turnEdited.connect(self._on_turn_edited)
+
+        self.table = WeekTableView()
         self.table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.table.setColumnCount(1 + len(DAYS))
-        self.table.setHorizontalHeaderLabels(["Empleado"] + DAYS)
+        self.table.setModel(self._week_model)
         self.table.verticalHeader().setVisible(False)
 
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(True)
         self.table.setStyleSheet(
             """
-            QTableWidget {
+            QTableView {
                 gridline-color: #d0d0d0;
                 font-size: 13px;
             }
@@ -437,18 +835,13 @@ class MainWindow(QMainWindow):
             """
         )
 
-        h = self.table.horizontalHeader()
-        h.setSectionResizeMode(QHeaderView.Stretch)
-        h.setStretchLastSection(True)
-
-        self.table.setColumnWidth(0, 260)
+        self.table.setup_columns(name_width=260)
         self.table.verticalHeader().setDefaultSectionSize(34)
 
-        self.table.setEditTriggers(QTableWidget.DoubleClicked | QTableWidget.SelectedClicked)
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked)
         self._turn_delegate = TurnDelegate(self.table)
         self.table.setItemDelegate(self._turn_delegate)
 
-        self.table.itemChanged.connect(self._on_item_changed)
         root.addWidget(self.table)
 
         self.lbl_footer = QLabel("")
@@ -470,18 +863,7 @@ class MainWindow(QMainWindow):
             d = TURN_DEFS[code]
             chip = QLabel(f"{code} = {d['label']}")
             chip.setAlignment(Qt.AlignCenter)
-            chip.setStyleSheet(
-                f"""
-                QLabel {{
-                    background: {d['bg']};
-                    color: {d['fg']};
-                    border: 1px solid #cfcfcf;
-                    border-radius: 10px;
-                    padding: 4px 10px;
-                    font-weight: 600;
-                }}
-                """
-            )
+            chip.setStyleSheet(TURN_CHIP_QSS[code])
             chip.setToolTip(d["hours"])
             lay.addWidget(chip)
 
@@ -495,18 +877,7 @@ class MainWindow(QMainWindow):
             d = ABSENCE_DEFS[code]
             chip = QLabel(code)
             chip.setAlignment(Qt.AlignCenter)
-            chip.setStyleSheet(
-                f"""
-                QLabel {{
-                    background: {d['bg']};
-                    color: {d['fg']};
-                    border: 1px solid #cfcfcf;
-                    border-radius: 10px;
-                    padding: 4px 10px;
-                    font-weight: 700;
-                }}
-                """
-            )
+            chip.setStyleSheet(ABSENCE_CHIP_QSS[code])
             chip.setToolTip(d["label"])
             lay.addWidget(chip)
 
@@ -537,10 +908,10 @@ class MainWindow(QMainWindow):
         form.setSpacing(10)
 
         self.abs_emp = QComboBox()
-        self.abs_emp.addItems([f"{e.code} - {e.name}" for e in self._employees])
+        self.abs_emp.addItems(self._employee_labels)
 
         self.abs_type = QComboBox()
-        self.abs_type.addItems([f"{c} - {ABSENCE_DEFS[c]['label']}" for c in ABSENCE_ORDER])
+        self.abs_type.addItems(ABSENCE_TYPE_LABELS)
         self.abs_type.currentIndexChanged.connect(self._on_abs_type_changed)
 
         self.abs_start = QDateEdit()
@@ -580,9 +951,8 @@ class MainWindow(QMainWindow):
 
         root.addLayout(form)
 
-        self.abs_table = QTableWidget()
-        self.abs_table.setColumnCount(6)
-        self.abs_table.setHorizontalHeaderLabels(["Empleado", "Tipo", "Inicio", "Fin", "Parte", "Notas"])
+        self.abs_table = QTableView()
+        self.abs_table.setModel(self._abs_model)
         self.abs_table.verticalHeader().setVisible(False)
         self.abs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.abs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -601,7 +971,6 @@ class MainWindow(QMainWindow):
         actions.addWidget(self.abs_delete)
         root.addLayout(actions)
 
-        self._refresh_absences_table()
         return page
 
     def _on_abs_start_changed(self) -> None:
@@ -615,10 +984,10 @@ class MainWindow(QMainWindow):
 
     def _on_abs_type_changed(self) -> None:
         code = self.abs_type.currentText().split(" - ", 1)[0].strip()
-        rules = ABSENCE_RULES.get(code, {})
+        spec = ABSENCE_RULE_SPECS.get(code, EMPTY_SPEC)
 
         # Forzar parte si aplica
-        forced_part = rules.get("forced_part")
+        forced_part = spec.forced_part
         if forced_part == "PM":
             self.abs_part.setCurrentText("Tarde")
             self.abs_end.setDate(self.abs_start.date())
@@ -627,8 +996,7 @@ class MainWindow(QMainWindow):
             self.abs_end.setDate(self.abs_start.date())
 
         # Para permisos de 1 día típicos, si el usuario cambia, dejamos fin = inicio
-        max_days = rules.get("max_days")
-        if isinstance(max_days, int) and max_days == 1:
+        if spec.max_days == 1:
             self.abs_end.setDate(self.abs_start.date())
 
     def _add_absence(self) -> None:
@@ -638,7 +1006,7 @@ class MainWindow(QMainWindow):
         start = self._qdate_to_date(self.abs_start.date())
         end = self._qdate_to_date(self.abs_end.date())
         if end < start:
-            QMessageBox.warning(self, "Ausencias", "La fecha de fin no puede ser anterior a la de inicio.")
+            self._warn("Ausencias", "La fecha de fin no puede ser anterior a la de inicio.")
             return
 
         part_txt = self.abs_part.currentText()
@@ -650,7 +1018,7 @@ class MainWindow(QMainWindow):
 
         # Regla: no permitimos AM/PM en rangos de varios días (evita líos)
         if part != "FULL" and start != end:
-            QMessageBox.warning(self, "Ausencias", "Si eliges Mañana/Tarde debe ser un único día (inicio = fin).")
+            self._warn("Ausencias", "Si eliges Mañana/Tarde debe ser un único día (inicio = fin).")
             return
 
         notes = self.abs_notes.text().strip()
@@ -659,26 +1027,28 @@ class MainWindow(QMainWindow):
             Absence(employee_code=emp_code, type_code=type_code, start=start, end=end, part=part, notes=notes)
         )
         if not ok:
-            QMessageBox.warning(self, "Ausencias", reason)
+            self._warn("Ausencias", reason)
             return
 
-        self._absences.append(Absence(emp_code, type_code, start, end, part, notes))
+        new_abs = Absence(emp_code, type_code, start, end, part, notes)
+        self._abs_model.append(new_abs)
+        self._index_absence(new_abs)
         self.abs_notes.clear()
 
-        self._refresh_absences_table()
         self._load_table()
 
     def _validate_absence(self, new_abs: Absence) -> tuple[bool, str]:
         code = new_abs.type_code
-        rules = ABSENCE_RULES.get(code, {})
+        spec = ABSENCE_RULE_SPECS.get(code, EMPTY_SPEC)
+        emp_absences = self._absences_by_emp[new_abs.employee_code]
 
         # Forzar parte si aplica
-        forced_part = rules.get("forced_part")
+        forced_part = spec.forced_part
         if forced_part and new_abs.part != forced_part:
             return False, f"Este tipo de permiso exige parte fija: {'Tarde' if forced_part=='PM' else 'Mañana'}."
 
         # Max días (si aplica)
-        max_days = rules.get("max_days")
+        max_days = spec.max_days
         days_len = (new_abs.end - new_abs.start).days + 1
         if isinstance(max_days, int) and days_len > max_days:
             return False, f"Este permiso no puede superar {max_days} día(s)."
@@ -691,8 +1061,8 @@ class MainWindow(QMainWindow):
 
             # Cuenta días ya pedidos en ese año
             used = 0.0
-            for a in self._absences:
-                if a.employee_code != new_abs.employee_code or a.type_code != "AP":
+            for a in emp_absences:
+                if a.type_code != "AP":
                     continue
                 if a.start.year != new_abs.start.year:
                     continue
@@ -700,24 +1070,22 @@ class MainWindow(QMainWindow):
 
             used += self._absence_units(new_abs)
 
-            max_per_year = rules.get("max_per_year_days", 2)
+            max_per_year = 2 if spec.max_per_year_days is None else spec.max_per_year_days
             if used > float(max_per_year) + 1e-9:
                 return False, f"Asuntos propios: máximo {max_per_year} días/año. Ya llevas {used - self._absence_units(new_abs):g}."
 
             # Restricción convenio: no 2 empleados el mismo día salvo acuerdo
-            for day in self._iter_days(new_abs.start, new_abs.end):
-                for a in self._absences:
-                    if a.type_code != "AP":
-                        continue
-                    if a.employee_code == new_abs.employee_code:
-                        continue
-                    if a.start <= day <= a.end:
-                        return False, f"Asuntos propios: ya hay otro empleado con AP el {day.strftime('%d/%m/%Y')}."
+            other_ap_dates = set()
+            for a in self._absences_by_type["AP"]:
+                if a.employee_code != new_abs.employee_code:
+                    other_ap_dates.update(self._day_list(a.start, a.end))
+            new_days = self._day_list(new_abs.start, new_abs.end)
+            if not other_ap_dates.isdisjoint(new_days):
+                day = next(d for d in new_days if d in other_ap_dates)
+                return False, f"Asuntos propios: ya hay otro empleado con AP el {day.strftime('%d/%m/%Y')}."
 
             # Restricción convenio: no acumular a vacaciones (lo interpretamos como: no pegado a VAC)
-            for a in self._absences:
-                if a.employee_code != new_abs.employee_code:
-                    continue
+            for a in emp_absences:
                 if a.type_code != "VAC":
                     continue
                 # solapado
@@ -753,10 +1121,9 @@ class MainWindow(QMainWindow):
                 return False, "Este permiso solo aplica el 31/12 (tarde)."
 
         # No duplicar exactamente la misma ausencia (mismo empleado, tipo, fechas, parte)
-        for a in self._absences:
+        for a in emp_absences:
             if (
-                a.employee_code == new_abs.employee_code
-                and a.type_code == new_abs.type_code
+                a.type_code == new_abs.type_code
                 and a.start == new_abs.start
                 and a.end == new_abs.end
                 and a.part == new_abs.part
@@ -764,20 +1131,27 @@ class MainWindow(QMainWindow):
                 return False, "Esa ausencia ya existe."
 
         # No permitir solapes de ausencias en el mismo empleado (simplificación sana)
-        for a in self._absences:
-            if a.employee_code != new_abs.employee_code:
-                continue
-            if not (new_abs.end < a.start or new_abs.start > a.end):
+        emp = new_abs.employee_code
+        for year, mask in self._year_masks(new_abs.start, new_abs.end):
+            if self._occupied.get((emp, year), 0) & mask:
                 return False, "No se permite solapar ausencias en el mismo empleado."
 
         return True, "OK"
 
     @staticmethod
-    def _iter_days(start: date, end: date):
-        d = start
-        while d <= end:
-            yield d
-            d += timedelta(days=1)
+    def _day_list(start: date, end: date) -> List[date]:
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    @staticmethod
+    def _year_masks(start: date, end: date) -> List[tuple[int, int]]:
+        # Un (año, máscara) por cada año que toca el rango; bit 0 = 1 de enero
+        out = []
+        for year in range(start.year, end.year + 1):
+            first = max(start, date(year, 1, 1))
+            last = min(end, date(year, 12, 31))
+            offset = first.timetuple().tm_yday - 1
+            out.append((year, ((1 << ((last - first).days + 1)) - 1) << offset))
+        return out
 
     @staticmethod
     def _absence_units(a: Absence) -> float:
@@ -788,40 +1162,54 @@ class MainWindow(QMainWindow):
         return 0.5
 
     def _delete_selected_absence(self) -> None:
-        row = self.abs_table.currentRow()
-        if row < 0:
-            return
-        try:
-            self._absences.pop(row)
-        except IndexError:
+        row = self.abs_table.currentIndex().row()
+        if not (0 <= row < len(self._absences)):
             return
-        self._refresh_absences_table()
+        a = self._absences[row]
+        self._abs_model.remove_at(row)
+        self._unindex_absence(a)
         self._load_table()
 
-    def _refresh_absences_table(self) -> None:
-        self.abs_table.setRowCount(len(self._absences))
-        base_font = QFont()
-        base_font.setPointSize(11)
-
-        emp_name_by_code = {e.code: e.name for e in self._employees}
-
-        for r, a in enumerate(self._absences):
-            emp = f"{a.employee_code} - {emp_name_by_code.get(a.employee_code, '')}"
-            typ = f"{a.type_code} - {ABSENCE_DEFS.get(a.type_code, {}).get('label', a.type_code)}"
-            ini = a.start.strftime("%d/%m/%Y")
-            fin = a.end.strftime("%d/%m/%Y")
-            parte = {"FULL": "Día completo", "AM": "Mañana", "PM": "Tarde"}.get(a.part, a.part)
-            notes = a.notes
-
-            for c, val in enumerate([emp, typ, ini, fin, parte, notes]):
-                it = QTableWidgetItem(val)
-                it.setFont(base_font)
-                self.abs_table.setItem(r, c, it)
+    def _index_absence(self, a: Absence) -> None:
+        starts = self._starts_by_emp[a.employee_code]
+        i = bisect_right(starts, a.start)
+        starts.insert(i, a.start)
+        self._absences_by_emp[a.employee_code].insert(i, a)
+        self._absences_by_type[a.type_code].append(a)
+        for year, mask in self._year_masks(a.start, a.end):
+            key = (a.employee_code, year)
+            self._occupied[key] = self._occupied.get(key, 0) | mask
+
+    def _unindex_absence(self, a: Absence) -> None:
+        # Por identidad: dos ausencias pueden ser iguales campo a campo (p. ej. notas)
+        emp_list = self._absences_by_emp[a.employee_code]
+        for i, x in enumerate(emp_list):
+            if x is a:
+                del emp_list[i]
+                del self._starts_by_emp[a.employee_code][i]
+                break
+
+        type_list = self._absences_by_type[a.type_code]
+        for i, x in enumerate(type_list):
+            if x is a:
+                del type_list[i]
+                break
+
+        # Sin solapes por empleado: los bits de esta ausencia son solo suyos
+        for year, mask in self._year_masks(a.start, a.end):
+            key = (a.employee_code, year)
+            self._occupied[key] ^= mask
 
     # --------------------------
     # Semana / Fechas
     # --------------------------
     def _refresh_week_header(self) -> None:
+        # Misma semana que la ya pintada: nada que recalcular
+        key = self._week_start.toordinal()
+        if key == self._header_key:
+            return
+        self._header_key = key
+
         end = self._week_start + timedelta(days=6)
         self.lbl_week.setText(f"Semana ({self._week_start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')})")
 
@@ -834,116 +1222,93 @@ class MainWindow(QMainWindow):
         for i, d in enumerate(DAYS):
             day_date = self._week_start + timedelta(days=i)
             headers.append(f"{d}\n{day_date.strftime('%d/%m')}")
-        self.table.setHorizontalHeaderLabels(headers)
+        self._week_model.set_headers(headers)
 
     def _on_week_picker_changed(self, qd: QDate) -> None:
+        # Escribir/girar la rueda en el QDateEdit emite muchas señales: esperamos a que pare
+        self._week_picker_timer.start()
+
+    def _apply_week_picker(self) -> None:
         # Si eliges 04/04 -> esa es la semana base; y navegará desde ahí.
-        self._week_start = self._qdate_to_date(qd)
-        self._refresh_week_header()
-        self._load_table()
+        self._set_week_start(self._qdate_to_date(self.week_picker.date()))
 
     def _prev_week(self) -> None:
-        self._week_start = self._week_start - timedelta(days=7)
-        self._refresh_week_header()
-        self._load_table()
+        self._set_week_start(self._week_start - timedelta(days=7))
 
     def _next_week(self) -> None:
-        self._week_start = self._week_start + timedelta(days=7)
-        self._refresh_week_header()
-        self._load_table()
+        self._set_week_start(self._week_start + timedelta(days=7))
 
     def _go_today(self) -> None:
-        self._week_start = date.today()
+        self._set_week_start(date.today())
+
+    def _set_week_start(self, new_start: date) -> None:
+        # "Hoy" repetido o el picker reemitiendo la misma fecha: nada que recargar
+        if new_start == self._week_start:
+            return
+        self._week_start = new_start
+        self._schedule_reload()
+
+    def _schedule_reload(self) -> None:
+        # Agrupa ráfagas (clics seguidos en ‹ / ›) en un único repintado en el siguiente ciclo
+        if self._reload_pending:
+            return
+        self._reload_pending = True
+        QTimer.singleShot(0, self._do_reload)
+
+    def _do_reload(self) -> None:
+        self._reload_pending = False
         self._refresh_week_header()
         self._load_table()
 
     @staticmethod
     def _qdate_to_date(qd: QDate) -> date:
-        return date(qd.year(), qd.month(), qd.day())
+        return qd.toPython()
 
     # --------------------------
     # Datos / Lógica
     # --------------------------
     def _load_table(self) -> None:
-        self.table.blockSignals(True)
-
-        self.table.setRowCount(len(self._employees))
-        base_font = QFont()
-        base_font.setPointSize(11)
-
-        for r, emp in enumerate(self._employees):
-            name_item = QTableWidgetItem(f"{emp.code} - {emp.name}")
-            name_item.setFlags(name_item.flags() & ~Qt.ItemIsEditable)
-            name_item.setFont(base_font)
-            self.table.setItem(r, 0, name_item)
-
-            week = self._schedule.get(emp.code, ["L"] * 7)
-            for c, value in enumerate(week, start=1):
-                v = (value or "L").strip().upper()
-                if v not in TURN_DEFS:
-                    v = "L"
-
-                it = QTableWidgetItem(v)
-                it.setTextAlignment(Qt.AlignCenter)
-                it.setFont(base_font)
-                self._apply_turn_style(it, v)
-
-                cell_date = self._week_start + timedelta(days=(c - 1))
-                abs_hit = self._find_absence(emp.code, cell_date)
-                if abs_hit is not None:
-                    self._apply_absence_style(it, abs_hit)
-
-                self.table.setItem(r, c, it)
-
-        self.table.blockSignals(False)
+        names: List[str] = []
+        turns: List[List[str]] = []
+        absences: List[List[Optional[Absence]]] = []
+        week_end = self._week_start + timedelta(days=len(DAYS) - 1)
+
+        for emp in self._employees:
+            names.append(emp.label)
+
+            # _schedule ya viene normalizado: copia directa (el modelo edita su propia lista)
+            turns.append(list(self._schedule.get(emp.code, _DEFAULT_WEEK)))
+            absences.append(self._week_absences(emp.code, week_end))
+
+        if not self._week_model.same_rows(names):
+            self._week_model.reset_rows(names, turns, absences)
+        else:
+            # Cambio de semana con la misma plantilla: reescritura en sitio
+            self._week_model.update_rows(turns, absences)
+        # Recuento completo solo al cargar; las ediciones lo ajustan en _on_turn_edited
+        self._tarde_counts = self._week_model.count_per_day("T")
         self._update_footer()
 
-    def _find_absence(self, emp_code: str, day: date) -> Optional[Absence]:
-        for a in self._absences:
-            if a.employee_code != emp_code:
-                continue
-            if a.start <= day <= a.end:
-                return a
-        return None
-
-    def _apply_turn_style(self, item: QTableWidgetItem, code: str) -> None:
-        v = (code or "").strip().upper()
-        if v not in TURN_DEFS:
-            v = "L"
-        d = TURN_DEFS[v]
-
-        item.setBackground(QColor(d["bg"]))
-        item.setForeground(QColor(d["fg"]))
-        item.setToolTip(f"{v} = {d['label']} · {d['hours']}")
-        item.setFlags(item.flags() | Qt.ItemIsEditable)
-
-    def _apply_absence_style(self, item: QTableWidgetItem, a: Absence) -> None:
-        d = ABSENCE_DEFS.get(a.type_code, {"label": a.type_code, "bg": "#E5E7EB", "fg": "#111827"})
-        part_txt = {"FULL": "Día completo", "AM": "Mañana", "PM": "Tarde"}.get(a.part, a.part)
-
-        item.setText(a.type_code)
-        item.setBackground(QColor(d["bg"]))
-        item.setForeground(QColor(d["fg"]))
-        tooltip = f"{a.type_code} · {d['label']} · {part_txt}"
-        if a.notes:
-            tooltip += f"\nNotas: {a.notes}"
-        item.setToolTip(tooltip)
-
-        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+    def _week_absences(self, emp_code: str, week_end: date) -> List[Optional[Absence]]:
+        # Un barrido por empleado: se pintan los días de cada ausencia que toca la semana
+        row: List[Optional[Absence]] = [None] * len(DAYS)
+        starts = self._starts_by_emp.get(emp_code)
+        if not starts:
+            return row
+        emp_absences = self._absences_by_emp[emp_code]
+        # Ordenadas por inicio y sin solapes: hacia atrás hasta la primera que acaba antes
+        i = bisect_right(starts, week_end) - 1
+        while i >= 0 and emp_absences[i].end >= self._week_start:
+            a = emp_absences[i]
+            first = max(0, (a.start - self._week_start).days)
+            last = min(len(DAYS) - 1, (a.end - self._week_start).days)
+            for d in range(first, last + 1):
+                row[d] = a
+            i -= 1
+        return row
 
     def _compute_coverage(self) -> List[Coverage]:
-        cover: List[Coverage] = []
-        for day_idx, day in enumerate(DAYS, start=1):
-            tardes = 0
-            for r in range(self.table.rowCount()):
-                it = self.table.item(r, day_idx)
-                if it is None:
-                    continue
-                v = (it.text() or "").strip().upper()
-                if v == "T":
-                    tardes += 1
-            cover.append(Coverage(day=day, tardes=tardes))
-        return cover
+        return [Coverage(day=day, tardes=n) for day, n in zip(DAYS, self._tarde_counts)]
 
     def _update_footer(self) -> None:
         cover = self._compute_coverage()
@@ -954,21 +1319,11 @@ class MainWindow(QMainWindow):
         self._dirty = dirty
         self.lbl_dirty.setVisible(dirty)
 
-    def _on_item_changed(self, item: QTableWidgetItem) -> None:
-        if item.column() == 0:
-            return
-
-        if not (item.flags() & Qt.ItemIsEditable):
-            return
-
-        v = (item.text() or "").strip().upper()
-        if v not in TURN_DEFS:
-            v = "L"
-            item.setText(v)
-
-        self._apply_turn_style(item, v)
+    def _on_turn_edited(self, row: int, day: int, old: str, code: str) -> None:
         self._set_dirty(True)
-        self._update_footer()
+        # Las celdas editables nunca tienen ausencia: solo cuenta el cambio de turno
+        self._tarde_counts[day] += (code == "T") - (old == "T")
+        self._footer_timer.start()
 
     def _on_save(self) -> None:
         if not self._dirty:
@@ -991,4 +1346,18 @@ class MainWindow(QMainWindow):
         event.accept()
 
     def _toast(self, msg: str) -> None:
-        QMessageBox.information(self, "Info", msg)
+        self._message_box(QMessageBox.Information, "Info", msg).exec()
+
+    def _warn(self, title: str, msg: str) -> None:
+        self._message_box(QMessageBox.Warning, title, msg).exec()
+
+    def _message_box(self, icon: QMessageBox.Icon, title: str, msg: str) -> QMessageBox:
+        # Un QMessageBox reutilizable por icono: evita construir y re-estilar un diálogo por aviso
+        box = self._msgbox_cache.get(icon)
+        if box is None:
+            box = QMessageBox(icon, title, msg, QMessageBox.Ok, self)
+            self._msgbox_cache[icon] = box
+        else:
+            box.setWindowTitle(title)
+            box.setText(msg)
+        return box
@@ -0,0 +1,83 @@
+import random
+from datetime import date, timedelta
+
+from farmacia_app.domain.absence_policy import (
+    Absence,
+    AbsenceIndex,
+    AbsencePolicy,
+    _overlaps,
+    validate_new_absence,
+)
+
+
+def _random_absences(rng: random.Random, n: int):
+    # Histórico con rangos que cruzan año, medios días y tipos mezclados
+    out = []
+    for _ in range(n):
+        emp = rng.choice("ABC")
+        code = rng.choice(["VAC", "AP", "ap ", "BAJ"])
+        start = date(2025, 11, 1) + timedelta(days=rng.randint(0, 120))
+        if rng.random() < 0.3:
+            out.append(Absence(emp, code, start, start, rng.choice(["AM", "PM"])))
+        else:
+            out.append(Absence(emp, code, start, start + timedelta(days=rng.randint(0, 40))))
+    return out
+
+
+def _linear_overlapping(existing, new):
+    return [a for a in existing if a.employee_code == new.employee_code and _overlaps(a, new)]
+
+
+def test_overlapping_matches_linear_scan():
+    rng = random.Random(1234)
+    existing = _random_absences(rng, 150)
+    index = AbsenceIndex(existing)
+    assert len(index) == len(existing)
+
+    for new in _random_absences(rng, 300):
+        expected = _linear_overlapping(existing, new)
+        got = list(index.overlapping(new))
+        assert sorted(map(id, got)) == sorted(map(id, expected))
+
+
+def test_validate_matches_linear_path():
+    rng = random.Random(99)
+    policy = AbsencePolicy(vacation_days_per_year=30.0, asuntos_propios_days_per_year=2.0)
+    for _ in range(20):
+        existing = _random_absences(rng, 40)
+        index = AbsenceIndex(existing)
+        for new in _random_absences(rng, 40):
+            assert validate_new_absence(new, index, policy) == validate_new_absence(new, existing, policy)
+
+
+def test_long_span_across_new_year_is_found():
+    # La ausencia larga empieza mucho antes: el límite inferior sale de la más larga
+    existing = [
+        Absence("A", "VAC", date(2025, 12, 1), date(2026, 1, 20)),
+        Absence("A", "AP", date(2026, 1, 10), date(2026, 1, 10), "AM"),
+    ]
+    new = Absence("A", "BAJ", date(2026, 1, 15), date(2026, 1, 15))
+    assert list(AbsenceIndex(existing).overlapping(new)) == [existing[0]]
+    ok, _ = validate_new_absence(new, AbsenceIndex(existing))
+    assert not ok
+
+
+def test_half_days_am_pm_do_not_overlap():
+    am = Absence("A", "AP", date(2026, 3, 2), date(2026, 3, 2), "AM")
+    index = AbsenceIndex([am])
+    pm = Absence("A", "AP", date(2026, 3, 2), date(2026, 3, 2), "PM")
+    assert list(index.overlapping(pm)) == []
+    assert list(index.overlapping(Absence("A", "AP", pm.start, pm.end, "AM"))) == [am]
+    assert validate_new_absence(pm, index) == validate_new_absence(pm, [am]) == (True, "OK")
+
+
+def test_vacation_usage_split_by_year():
+    # 2025-12-20..2026-01-09: 12 días en 2025 y 9 en 2026
+    existing = [Absence("A", "VAC", date(2025, 12, 20), date(2026, 1, 9))]
+    policy = AbsencePolicy(vacation_days_per_year=21.0)
+    fits = Absence("A", "VAC", date(2026, 6, 1), date(2026, 6, 12))     # 9 + 12 = 21
+    too_long = Absence("A", "VAC", date(2026, 6, 1), date(2026, 6, 13))  # 9 + 13 = 22
+    for history in (existing, AbsenceIndex(existing)):
+        assert validate_new_absence(fits, history, policy) == (True, "OK")
+        ok, msg = validate_new_absence(too_long, history, policy)
+        assert not ok and "2026" in msg